@@ -0,0 +1,92 @@
+"""fulltext search
+
+Revision ID: 3b9e1c7d2a40
+Revises: f791ffc19aa0
+Create Date: 2026-10-19 10:12:41.118402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9e1c7d2a40'
+down_revision: Union[str, None] = 'f791ffc19aa0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# DDL is copied here (not imported from the app) so this revision stays frozen.
+SQLITE_DDL = {
+    "review_files": [
+        """CREATE VIRTUAL TABLE IF NOT EXISTS review_files_fts USING fts5(
+            content, content='review_files', content_rowid='id',
+            tokenize="unicode61 tokenchars '_'")""",
+        """CREATE TRIGGER IF NOT EXISTS review_files_fts_ai AFTER INSERT ON review_files BEGIN
+            INSERT INTO review_files_fts(rowid, content) VALUES (new.id, new.content);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS review_files_fts_ad AFTER DELETE ON review_files BEGIN
+            INSERT INTO review_files_fts(review_files_fts, rowid, content) VALUES ('delete', old.id, old.content);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS review_files_fts_au AFTER UPDATE ON review_files BEGIN
+            INSERT INTO review_files_fts(review_files_fts, rowid, content) VALUES ('delete', old.id, old.content);
+            INSERT INTO review_files_fts(rowid, content) VALUES (new.id, new.content);
+        END""",
+    ],
+    "review_issues": [
+        """CREATE VIRTUAL TABLE IF NOT EXISTS review_issues_fts USING fts5(
+            message, content='review_issues', content_rowid='id',
+            tokenize="unicode61 tokenchars '_'")""",
+        """CREATE TRIGGER IF NOT EXISTS review_issues_fts_ai AFTER INSERT ON review_issues BEGIN
+            INSERT INTO review_issues_fts(rowid, message) VALUES (new.id, new.message);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS review_issues_fts_ad AFTER DELETE ON review_issues BEGIN
+            INSERT INTO review_issues_fts(review_issues_fts, rowid, message) VALUES ('delete', old.id, old.message);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS review_issues_fts_au AFTER UPDATE ON review_issues BEGIN
+            INSERT INTO review_issues_fts(review_issues_fts, rowid, message) VALUES ('delete', old.id, old.message);
+            INSERT INTO review_issues_fts(rowid, message) VALUES (new.id, new.message);
+        END""",
+    ],
+}
+
+POSTGRES_DDL = {
+    "review_files": [
+        """ALTER TABLE review_files ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (to_tsvector('simple', coalesce(content, ''))) STORED""",
+        """CREATE INDEX IF NOT EXISTS ix_review_files_search ON review_files USING gin (search_vector)""",
+    ],
+    "review_issues": [
+        """ALTER TABLE review_issues ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (to_tsvector('simple', coalesce(message, ''))) STORED""",
+        """CREATE INDEX IF NOT EXISTS ix_review_issues_search ON review_issues USING gin (search_vector)""",
+    ],
+}
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for stmt in SQLITE_DDL["review_files"] + SQLITE_DDL["review_issues"]:
+            op.execute(stmt)
+        # Index rows that existed before the triggers were installed.
+        op.execute("INSERT INTO review_files_fts(review_files_fts) VALUES ('rebuild')")
+        op.execute("INSERT INTO review_issues_fts(review_issues_fts) VALUES ('rebuild')")
+    elif dialect == "postgresql":
+        for stmt in POSTGRES_DDL["review_files"] + POSTGRES_DDL["review_issues"]:
+            op.execute(stmt)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for table in ("review_files", "review_issues"):
+            for suffix in ("ai", "ad", "au"):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {table}_fts")
+    elif dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_review_issues_search")
+        op.execute("DROP INDEX IF EXISTS ix_review_files_search")
+        op.execute("ALTER TABLE review_issues DROP COLUMN IF EXISTS search_vector")
+        op.execute("ALTER TABLE review_files DROP COLUMN IF EXISTS search_vector")
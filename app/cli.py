@@ -0,0 +1,211 @@
+"""
+Offline analysis of a local directory tree, without HTTP or a database.
+
+    python -m app.cli analyze <dir> [--format ndjson|sarif] [--jobs N] [--summarize]
+
+Findings are written to stdout as they are produced. Only the static rules and
+file utilities are imported up front; FastAPI, SQLAlchemy and the LLM client
+are never loaded, except the LLM client when --summarize is given.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, TextIO
+from .config import get_settings
+from .utils.file_utils import DEFAULT_EXCLUDES, IgnoreRules, head_tail, safe_decode, sniff_language, walk_tree
+from .services.analyzer.static_rules import run_static_rules
+
+SEVERITY_ORDER = {"info": 0, "warn": 1, "error": 2}
+SARIF_LEVEL = {"info": "note", "warn": "warning", "error": "error"}
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+
+def _analyze_path(task: tuple[str, str, int, bool, int]) -> dict:
+    """
+    Process-pool worker: read, sniff and run the static rules on one file.
+    With preview_chars > 0 a head/tail preview of that size is returned for
+    the summary, never the whole file. Any error is reported as `skipped`
+    so one bad file can't abort the run.
+    """
+    root, rel, max_bytes, all_files, preview_chars = task
+    lang = sniff_language(rel)
+    result = {"path": rel, "language": lang, "findings": [], "preview": None, "skipped": None}
+    if lang is None and not all_files:
+        result["skipped"] = "unknown language"
+        return result
+    try:
+        _analyze_file(Path(root, rel), rel, lang, max_bytes, preview_chars, result)
+    except OSError as e:
+        result["skipped"] = str(e)
+    except Exception as e:
+        result["skipped"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def _analyze_file(path: Path, rel: str, lang: str | None, max_bytes: int, preview_chars: int, result: dict) -> None:
+    raw = path.read_bytes()
+    if len(raw) > max_bytes:
+        result["skipped"] = f"larger than {max_bytes} bytes"
+        return
+    if b"\0" in raw[:8192]:
+        result["skipped"] = "binary"
+        return
+    content = safe_decode(raw)
+    result["findings"] = [
+        {"rule_id": f.rule_id, "severity": f.severity, "message": f.message, "line": f.line}
+        for f in run_static_rules(rel, lang, content)
+    ]
+    if preview_chars:
+        result["preview"] = head_tail(content, preview_chars)
+
+
+class NdjsonWriter:
+    def __init__(self, out: TextIO):
+        self.out = out
+
+    def start(self) -> None:
+        pass
+
+    def finding(self, path: str, language: str | None, f: dict) -> None:
+        self.out.write(json.dumps({"file": path, "language": language, **f}) + "\n")
+        self.out.flush()
+
+    def finish(self, summary: tuple[str, bool] | None) -> None:
+        if summary is not None:
+            self.out.write(json.dumps({"summary": summary[0], "llm_used": summary[1]}) + "\n")
+        self.out.flush()
+
+
+class SarifWriter:
+    """
+    Streams a SARIF 2.1.0 log: results are written as they arrive and the
+    tool/rules section follows them (JSON member order is not significant).
+    """
+
+    def __init__(self, out: TextIO):
+        self.out = out
+        self.rules: dict[str, str] = {}
+        self.count = 0
+
+    def start(self) -> None:
+        self.out.write(f'{{"version": "2.1.0", "$schema": "{SARIF_SCHEMA}", "runs": [{{"results": [\n')
+        self.out.flush()
+
+    def finding(self, path: str, language: str | None, f: dict) -> None:
+        self.rules.setdefault(f["rule_id"], f["message"])
+        location: dict = {"artifactLocation": {"uri": path}}
+        if f["line"]:
+            location["region"] = {"startLine": f["line"]}
+        result = {
+            "ruleId": f["rule_id"],
+            "level": SARIF_LEVEL.get(f["severity"], "note"),
+            "message": {"text": f["message"]},
+            "locations": [{"physicalLocation": location}],
+        }
+        self.out.write(("," if self.count else "") + json.dumps(result) + "\n")
+        self.count += 1
+        self.out.flush()
+
+    def finish(self, summary: tuple[str, bool] | None) -> None:
+        driver = {
+            "name": "code-review-assistant",
+            "rules": [{"id": rid, "shortDescription": {"text": msg}} for rid, msg in self.rules.items()],
+        }
+        tail: dict = {"tool": {"driver": driver}}
+        if summary is not None:
+            tail["properties"] = {"summary": summary[0], "llm_used": summary[1]}
+        self.out.write("], " + json.dumps(tail)[1:] + "]}\n")
+        self.out.flush()
+
+
+def _iter_results(tasks: list[tuple], jobs: int) -> Iterable[dict]:
+    if jobs <= 1 or len(tasks) < 2:
+        yield from map(_analyze_path, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        # map() yields in submission order as soon as each chunk is done.
+        yield from pool.map(_analyze_path, tasks, chunksize=max(1, min(32, len(tasks) // (jobs * 4))))
+
+
+def cmd_analyze(args: argparse.Namespace) -> int:
+    root = Path(args.path)
+    if not root.is_dir():
+        print(f"error: {root} is not a directory", file=sys.stderr)
+        return 2
+
+    ignore = IgnoreRules(DEFAULT_EXCLUDES)
+    if not args.no_gitignore:
+        ignore.add_file(root / ".gitignore")
+    for pat in args.exclude:
+        ignore.add(pat)
+
+    settings = get_settings()
+    preview_chars = settings.llm_per_file_chars if args.summarize else 0
+    tasks = [(str(root), rel, args.max_bytes, args.all_files, preview_chars) for rel in walk_tree(root, ignore)]
+    writer = SarifWriter(sys.stdout) if args.format == "sarif" else NdjsonWriter(sys.stdout)
+    threshold = SEVERITY_ORDER.get(args.fail_on)
+    worst = -1
+    # Previews are only kept until they fill the summary's total budget.
+    analyzed: list[tuple[str, str, str | None]] = []
+    preview_budget = settings.llm_total_chars
+    issues: list[dict] = []
+
+    writer.start()
+    for res in _iter_results(tasks, args.jobs):
+        if res["skipped"] and args.verbose:
+            print(f"skip {res['path']}: {res['skipped']}", file=sys.stderr)
+        for f in res["findings"]:
+            worst = max(worst, SEVERITY_ORDER.get(f["severity"], 0))
+            writer.finding(res["path"], res["language"], f)
+        if args.summarize and not res["skipped"]:
+            if preview_budget > 0:
+                analyzed.append((res["path"], res["preview"], res["language"]))
+                preview_budget -= len(res["preview"])
+            issues += [{**f, "filename": res["path"], "language": res["language"] or "unknown"}
+                       for f in res["findings"]]
+
+    summary = None
+    if args.summarize:
+        from .services.analyzer.summary import summarize
+        summary = summarize(analyzed, issues)
+    writer.finish(summary)
+
+    return 1 if threshold is not None and worst >= threshold else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("analyze", help="Run the static rules over a directory tree.")
+    p.add_argument("path", help="Directory to analyze.")
+    p.add_argument("--format", choices=["ndjson", "sarif"], default="ndjson")
+    p.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                   help="Worker processes (default: CPU count; 1 runs in-process).")
+    p.add_argument("--exclude", action="append", default=[], metavar="PATTERN",
+                   help="Extra gitignore-style pattern to skip (repeatable).")
+    p.add_argument("--no-gitignore", action="store_true", help="Don't read <path>/.gitignore.")
+    p.add_argument("--all-files", action="store_true",
+                   help="Also analyze files whose language can't be sniffed from the extension.")
+    p.add_argument("--max-bytes", type=int, default=1_000_000, help="Skip files larger than this.")
+    p.add_argument("--fail-on", choices=["error", "warn", "info", "never"], default="error",
+                   help="Exit 1 if any finding is at least this severe (default: error).")
+    p.add_argument("--summarize", action="store_true",
+                   help="Append an LLM (or static fallback) summary built like the API's.")
+    p.add_argument("--verbose", "-v", action="store_true", help="Report skipped files on stderr.")
+    p.set_defaults(func=cmd_analyze)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
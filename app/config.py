@@ -6,8 +6,20 @@ load_dotenv()
 
 class Settings:
     app_env: str = os.getenv("APP_ENV", "dev")
+    # Required as X-Admin-Token for /api/v1/admin; without it admin routes are only served outside prod
+    admin_token: str | None = os.getenv("ADMIN_TOKEN") or None
     database_url: str = os.getenv("DATABASE_URL", "sqlite:///./reviews.db")
 
+    # DB engine tuning (Postgres pool; SQLite pragmas)
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    db_pool_timeout: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    db_pool_pre_ping: bool = (os.getenv("DB_POOL_PRE_PING", "true").lower() == "true")
+    db_statement_timeout_ms: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+    sqlite_busy_timeout_ms: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    sqlite_mmap_size: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
     # LLM config
     openai_api_key: str | None = os.getenv("OPENAI_API_KEY") or None
     openai_base_url: str | None = os.getenv("OPENAI_BASE_URL") or None
@@ -18,6 +30,21 @@ class Settings:
     llm_total_chars: int = int(os.getenv("LLM_TOTAL_CHARS", "16000"))    
     llm_per_file_chars: int = int(os.getenv("LLM_PER_FILE_CHARS", "4000")) 
 
+    # Static rules: comma-separated rule ids to skip, e.g. "STYLE_LONG_LINE,DOC_TODO_NO_OWNER"
+    disabled_rules: list[str] = [r.strip() for r in os.getenv("DISABLED_RULES", "").split(",") if r.strip()]
+
+    # Serialized review responses kept in memory per worker
+    review_cache_max_bytes: int = int(os.getenv("REVIEW_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    # Serve cached entries (including 304s) without a DB check for this long after the last one.
+    # This is the staleness bound: a review deleted or replaced through another worker can be
+    # served from this worker's cache for up to this many seconds. 0 = check on every request.
+    review_cache_trust_seconds: float = float(os.getenv("REVIEW_CACHE_TRUST_SECONDS", "5"))
+
+    # Batch submissions
+    batch_max_items: int = int(os.getenv("BATCH_MAX_ITEMS", "500"))
+    batch_max_bytes: int = int(os.getenv("BATCH_MAX_BYTES", str(20 * 1024 * 1024)))
+    llm_batch_concurrency: int = int(os.getenv("LLM_BATCH_CONCURRENCY", "4"))
+
 @lru_cache
 def get_settings() -> Settings:
     return Settings()
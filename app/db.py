@@ -1,10 +1,62 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
-from .config import get_settings
+from .config import Settings, get_settings
 
 settings = get_settings()
 
-engine = create_engine(settings.database_url, future=True)
+def _sqlite_pragmas(s: Settings) -> list[str]:
+    return [
+        "PRAGMA journal_mode=WAL",
+        f"PRAGMA busy_timeout={s.sqlite_busy_timeout_ms}",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA mmap_size={s.sqlite_mmap_size}",
+    ]
+
+def make_engine(s: Settings) -> Engine:
+    """
+    Build the engine with settings tuned per backend.
+    SQLite: WAL + busy_timeout so several workers can write without "database is locked".
+    Postgres: sized connection pool, pre-ping and a server-side statement timeout.
+    """
+    url = make_url(s.database_url)
+    backend = url.get_backend_name()
+
+    if backend == "sqlite":
+        engine = create_engine(
+            url,
+            future=True,
+            connect_args={"check_same_thread": False, "timeout": s.sqlite_busy_timeout_ms / 1000},
+        )
+        pragmas = _sqlite_pragmas(s)
+
+        @event.listens_for(engine, "connect")
+        def _apply_pragmas(dbapi_conn, _record):
+            cur = dbapi_conn.cursor()
+            try:
+                for p in pragmas:
+                    cur.execute(p)
+            finally:
+                cur.close()
+
+        return engine
+
+    connect_args = {}
+    if backend == "postgresql" and s.db_statement_timeout_ms > 0:
+        connect_args["options"] = f"-c statement_timeout={s.db_statement_timeout_ms}"
+
+    return create_engine(
+        url,
+        future=True,
+        pool_size=s.db_pool_size,
+        max_overflow=s.db_max_overflow,
+        pool_timeout=s.db_pool_timeout,
+        pool_recycle=s.db_pool_recycle,
+        pool_pre_ping=s.db_pool_pre_ping,
+        connect_args=connect_args,
+    )
+
+engine = make_engine(settings)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
 Base = declarative_base()
 
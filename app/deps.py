@@ -1,4 +1,7 @@
+import secrets
+from fastapi import Header, HTTPException
 from sqlalchemy.orm import Session
+from .config import get_settings
 from .db import SessionLocal
 
 def get_db():
@@ -7,3 +10,11 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def require_admin(x_admin_token: str | None = Header(default=None)):
+    s = get_settings()
+    if s.admin_token:
+        if not x_admin_token or not secrets.compare_digest(x_admin_token, s.admin_token):
+            raise HTTPException(status_code=403, detail="Admin token required")
+    elif s.app_env == "prod":
+        raise HTTPException(status_code=404, detail="Not Found")
@@ -4,6 +4,8 @@ from fastapi.staticfiles import StaticFiles
 from .db import init_db
 from .routes.reviews import router as reviews_router
 from .routes.llm import router as llm_router
+from .routes.search import router as search_router
+from .routes.admin import router as admin_router
 
 
 
@@ -28,3 +30,5 @@ def health():
 
 app.include_router(reviews_router)
 app.include_router(llm_router)
+app.include_router(search_router)
+app.include_router(admin_router)
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends
+from ..deps import require_admin
+from ..schemas import RuleInfo, RuleProfile
+from ..services.analyzer.static_rules import profiler, registry
+
+router = APIRouter(prefix="/api/v1/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+@router.get("/rules", response_model=list[RuleInfo])
+def list_rules():
+    return registry.describe()
+
+@router.get("/rules/profile", response_model=list[RuleProfile])
+def rule_profile():
+    """Per-rule call counts, findings and timings for this worker process, slowest first."""
+    return profiler.report()
+
+@router.delete("/rules/profile")
+def reset_rule_profile():
+    profiler.reset()
+    return {"status": "reset"}
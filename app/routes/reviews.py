@@ -1,29 +1,31 @@
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List,Dict,Any
+import json
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Request, Header
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from typing import List,Dict,Any,Callable
 from ..deps import get_db
 from ..utils.file_utils import safe_decode, sniff_language
-from ..schemas import ReviewOut
+from pydantic import ValidationError
+from ..schemas import ReviewOut, ReviewDebugOut, BatchItem, BatchResult
+from ..config import get_settings
 from ..models import Review,ReviewFile,ReviewIssue
-from ..services.analyzer.orchestrator import analyze_review
-from fastapi.responses import JSONResponse
-from ..db import SessionLocal
+from ..services.analyzer.orchestrator import analyze_review, analyze_batch
+from fastapi.responses import JSONResponse, Response
+from ..services.review_cache import review_cache, make_etag, etag_matches
 
 from ..services.analyzer.llm_client import summarize_review
+from ..services.analyzer.rules import RuleStats
 
 
 
 router = APIRouter(prefix="/api/v1/reviews", tags=["reviews"])
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
 
-@router.post("/upload", response_model=ReviewOut)
+# ReviewDebugOut is listed first: it only matches when `debug` is present.
+@router.post("/upload", response_model=ReviewDebugOut | ReviewOut)
 async def upload_and_review(
     files: List[UploadFile] = File(...),
+    debug: bool = False,
     db: Session = Depends(get_db)
 ):
     if not files:
@@ -36,16 +38,146 @@ async def upload_and_review(
         lang = sniff_language(f.filename)
         prepared.append((f.filename, text, lang))
 
-    review = analyze_review(db, prepared)
-    return review
+    # Analysis, DB writes and serialization (which lazy-loads files/issues)
+    # are blocking; keep them all off the event loop so one worker can serve
+    # concurrent uploads.
+    stats: dict[str, RuleStats] | None = {} if debug else None
+    out = await run_in_threadpool(_analyze_and_serialize, db, prepared, stats)
+    if stats is not None:
+        debug_info = {"rules": [{"rule": name, **s.as_dict()} for name, s in stats.items()]}
+        return ReviewDebugOut(**out.model_dump(), debug=debug_info)
+    return out
 
-@router.get("/{review_id}", response_model=ReviewOut)
-def get_review(review_id: int, db: Session = Depends(get_db)):
-    review = db.get(Review, review_id)
+def _analyze_and_serialize(
+    db: Session,
+    files: list[tuple[str, str, str | None]],
+    stats: dict[str, RuleStats] | None,
+) -> ReviewOut:
+    return ReviewOut.model_validate(analyze_review(db, files, stats))
+
+def _parse_batch_item(raw: Any) -> list[tuple[str, str, str | None]] | Exception:
+    try:
+        if isinstance(raw, list):
+            raw = {"files": raw}
+        item = BatchItem.model_validate(raw)
+    except ValidationError as e:
+        problems = "; ".join(f"{'.'.join(map(str, err['loc'])) or 'item'}: {err['msg']}" for err in e.errors())
+        return ValueError(f"Invalid item: {problems}")
+    return [(f.filename, f.content, sniff_language(f.filename)) for f in item.files]
+
+def _parse_batch_body(body: bytes, content_type: str) -> list[Any]:
+    """
+    NDJSON content types are split into one item per line; lines that are not
+    valid JSON become per-item errors. Anything else is parsed as a single
+    JSON document: an array of items, or one item object.
+    An item is {"files": [{"filename", "content"}, ...]} or just the file list.
+    """
+    text = safe_decode(body).strip()
+    if "ndjson" not in content_type:
+        try:
+            doc = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON body: {e}")
+        if isinstance(doc, dict):
+            return [doc]
+        if isinstance(doc, list):
+            return doc
+        raise HTTPException(status_code=400, detail="Expected a JSON object or array of reviews.")
+
+    raw_items: list[Any] = []
+    for lineno, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            raw_items.append(json.loads(line))
+        except json.JSONDecodeError as e:
+            raw_items.append(ValueError(f"Invalid JSON on line {lineno}: {e.msg}"))
+    return raw_items
+
+async def _read_body_capped(request: Request, max_bytes: int) -> bytes:
+    too_large = HTTPException(status_code=413, detail=f"Batch body exceeds {max_bytes} bytes.")
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > max_bytes:
+        raise too_large
+    chunks: list[bytes] = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > max_bytes:
+            raise too_large
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+@router.post("/batch", response_model=BatchResult)
+async def batch_review(request: Request, llm: bool = False, db: Session = Depends(get_db)):
+    settings = get_settings()
+    body = await _read_body_capped(request, settings.batch_max_bytes)
+    raw_items = _parse_batch_body(body, request.headers.get("content-type", ""))
+    if not raw_items:
+        raise HTTPException(status_code=400, detail="No reviews received.")
+    max_items = settings.batch_max_items
+    if len(raw_items) > max_items:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {max_items} reviews.")
+
+    items = [r if isinstance(r, Exception) else _parse_batch_item(r) for r in raw_items]
+    results = await run_in_threadpool(analyze_batch, db, items, llm)
+    failed = sum(1 for r in results if r["status"] != "ok")
+    return {"succeeded": len(results) - failed, "failed": failed, "results": results}
+
+def _load_review(db: Session, review_id: int) -> Review:
+    review = db.get(Review, review_id, options=[selectinload(Review.files), selectinload(Review.issues)])
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
     return review
 
+def _cached_review_response(
+    db: Session,
+    review_id: int,
+    kind: str,
+    if_none_match: str | None,
+    render: Callable[[Review], bytes],
+) -> Response:
+    """
+    Serve a review representation from the in-process byte cache.
+    A cached entry is revalidated with one primary-key lookup (skipped
+    within REVIEW_CACHE_TRUST_SECONDS) so deletes from other workers and
+    reused ids are caught; a miss loads the graph, renders once and fills
+    the cache. The ETag hashes the bytes, so it changes with the content.
+    """
+    entry = review_cache.get(review_id, kind)
+    if entry is not None and review_cache.needs_revalidation(entry):
+        created_at = db.execute(select(Review.created_at).where(Review.id == review_id)).scalar_one_or_none()
+        if created_at != entry.created_at:
+            review_cache.invalidate(review_id)
+            entry = None
+        else:
+            review_cache.mark_validated(entry)
+
+    if entry is not None:
+        body, etag = entry.body, entry.etag
+    else:
+        with review_cache.rendering(review_id) as generation:
+            review = _load_review(db, review_id)
+            body = render(review)
+            etag = make_etag(body)
+            review_cache.put(review_id, kind, body, etag, review.created_at, generation)
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@router.get("/{review_id}", response_model=ReviewOut)
+def get_review(
+    review_id: int,
+    if_none_match: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+):
+    return _cached_review_response(
+        db, review_id, "review", if_none_match,
+        lambda r: ReviewOut.model_validate(r).model_dump_json().encode(),
+    )
+
 @router.get("/", response_model=list[ReviewOut])
 def list_reviews(db: Session = Depends(get_db)):
     return db.query(Review).order_by(Review.id.desc()).all()
@@ -56,7 +188,7 @@ def delete_review(review_id: int, db: Session = Depends(get_db)):
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
     db.delete(review)
-    db.commit()
+    db.commit()   # the after_commit hook in review_cache drops this worker's entries
     return {"status": "deleted", "id": review_id}
 
 def _serialize_review(r: Review) -> dict:
@@ -83,11 +215,16 @@ def _serialize_review(r: Review) -> dict:
     }
 
 @router.get("/{review_id}/export", response_class=JSONResponse)
-def export_review(review_id: int, db: Session = Depends(get_db)):
-    r = db.query(Review).filter(Review.id == review_id).first()
-    if not r:
-        raise HTTPException(status_code=404, detail="Review not found")
-    return JSONResponse(content=_serialize_review(r), media_type="application/json")
+def export_review(
+    review_id: int,
+    if_none_match: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+):
+    return _cached_review_response(
+        db, review_id, "export", if_none_match,
+        lambda r: JSONResponse(content=_serialize_review(r)).body,
+    )
+
 def create_review_from_files(db: Session, files: List[Dict[str, Any]]) -> Review:
     """
     files = [{ "filename": str, "content": bytes }, ...]
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from ..deps import get_db
+from ..schemas import SearchResults
+from ..services.search import search
+
+router = APIRouter(prefix="/api/v1/search", tags=["search"])
+
+@router.get("", response_model=SearchResults)
+def search_reviews(
+    q: str = Query(..., min_length=1, max_length=256),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    try:
+        total, hits = search(db, q, limit=page_size, offset=(page - 1) * page_size)
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    return {"query": q, "page": page, "page_size": page_size, "total": total, "hits": hits}
@@ -27,3 +27,60 @@ class ReviewOut(BaseModel):
     issues: list[Issue] = Field(default_factory=list)
 
     model_config = ConfigDict(from_attributes=True)
+
+class ReviewDebugOut(ReviewOut):
+    """Upload response with ?debug=true: adds per-rule timings for this request."""
+    debug: dict
+
+class RuleProfile(BaseModel):
+    rule: str
+    calls: int
+    findings: int
+    total_ms: float
+    avg_ms: float
+    max_ms: float
+    errors: int = 0
+
+class RuleCheck(BaseModel):
+    rule: str
+    enabled: bool
+
+class RuleInfo(BaseModel):
+    rule: str
+    languages: list[str] | None = None
+    enabled: bool
+    provides: list[RuleCheck] | None = None
+
+class BatchFile(BaseModel):
+    filename: str = Field(min_length=1, max_length=512)
+    content: str
+
+class BatchItem(BaseModel):
+    files: list[BatchFile] = Field(min_length=1)
+
+class BatchItemResult(BaseModel):
+    index: int
+    id: int | None = None
+    status: str
+    error: str | None = None
+
+class BatchResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: list[BatchItemResult] = Field(default_factory=list)
+
+class SearchHit(BaseModel):
+    kind: str
+    review_id: int
+    file_id: int | None = None
+    filename: str | None = None
+    line: int | None = None
+    snippet: str
+    rank: float
+
+class SearchResults(BaseModel):
+    query: str
+    page: int
+    page_size: int
+    total: int
+    hits: list[SearchHit] = Field(default_factory=list)
@@ -81,6 +81,10 @@ def _fallback(issues: List[Dict], msg: str | None = None) -> Tuple[str, bool]:
         text = f"Summary (LLM fallback due to error):\n- {msg}\n" + "\n".join(base)
     return (text, False)
 
+def static_summary(issues: List[Dict]) -> Tuple[str, bool]:
+    """Summary built from static findings only, without calling the LLM."""
+    return _fallback(issues)
+
 def call_llm_summarize(issues: List[Dict], file_blocks: List[Dict]) -> Tuple[str, bool]:
     if not settings.openai_enabled or not settings.openai_api_key:
         return _fallback(issues)
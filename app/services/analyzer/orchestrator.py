@@ -1,84 +1,118 @@
+from concurrent.futures import ThreadPoolExecutor
 from sqlalchemy.orm import Session
-from .static_rules import run_static_rules
-from .llm_client import call_llm_summarize
+from .rules import RuleStats
+from .static_rules import RuleFinding, run_static_rules
+from .llm_client import static_summary
+from .summary import issue_dicts, summarize
 from ...models import Review, ReviewFile, ReviewIssue
 from ...config import get_settings
 
 settings = get_settings()
 
-def _make_preview_blocks(files: list[tuple[str, str, str | None]]) -> list[dict]:
-    """
-    Build per-file previews constrained by settings.llm_per_file_chars and total budget.
-    Returns list of dicts: {filename, language, preview}
-    """
-    per_file = settings.llm_per_file_chars
-    total_budget = settings.llm_total_chars
-
-    blocks: list[dict] = []
-    remaining = total_budget
+def _collect_issues(
+    files: list[tuple[str, str, str | None]],
+    stats: dict[str, RuleStats] | None = None,
+) -> list[list[RuleFinding]]:
+    return [run_static_rules(filename, lang, content, stats) for filename, content, lang in files]
 
-    for (filename, content, lang) in files:
-        if remaining <= 0:
-            break
-        if len(content) <= per_file:
-            preview = content
-        else:
-            head = content[: per_file // 2]
-            tail = content[-(per_file // 2):]
-            preview = head + "\n...\n" + tail
-
-        if len(preview) > remaining:
-            preview = preview[:remaining]
-        blocks.append({"filename": filename, "language": lang or "unknown", "preview": preview})
-        remaining -= len(preview)
-    return blocks
-
-def analyze_review(db: Session, files: list[tuple[str, str, str | None]]) -> Review:
+def _build_review(
+    files: list[tuple[str, str, str | None]],
+    findings: list[list[RuleFinding]],
+    summary: str,
+    llm_used: bool,
+) -> Review:
     """
-    files: list of tuples (filename, content, language)
+    Build the Review/ReviewFile/ReviewIssue graph in memory so it can be
+    persisted with a single flush (batched INSERTs) instead of one per row.
     """
-    review = Review(llm_used=False)
-    db.add(review)
-    db.flush()
-
-    all_issue_dicts: list[dict] = []
-    file_records: list[ReviewFile] = []
-
-    for filename, content, lang in files:
-        rf = ReviewFile(review_id=review.id, filename=filename, content=content, language=lang)
-        db.add(rf)
-        db.flush()
-        file_records.append(rf)
-
-        for f in run_static_rules(filename, lang, content):
-            issue = ReviewIssue(
-                review_id=review.id,
-                file_id=rf.id,
+    review = Review(summary=summary, llm_used=llm_used)
+    for (filename, content, lang), file_findings in zip(files, findings):
+        rf = ReviewFile(filename=filename, content=content, language=lang)
+        review.files.append(rf)
+        for f in file_findings:
+            review.issues.append(ReviewIssue(
+                file=rf,
                 rule_id=f.rule_id,
                 severity=f.severity,
                 message=f.message,
                 line=f.line,
-            )
-            db.add(issue)
-            db.flush()
-            all_issue_dicts.append({
-                "rule_id": f.rule_id,
-                "severity": f.severity,
-                "message": f.message,
-                "line": f.line,
-                "file_id": rf.id,
-                "filename": filename,
-                "language": lang or "unknown",
-            })
+            ))
+    return review
 
-    file_blocks = _make_preview_blocks([(fr.filename, fr.content, fr.language) for fr in file_records])
+def analyze_review(
+    db: Session,
+    files: list[tuple[str, str, str | None]],
+    stats: dict[str, RuleStats] | None = None,
+) -> Review:
+    """
+    files: list of tuples (filename, content, language)
+    stats: optional dict that collects per-rule timings for this review
+    """
+    findings = _collect_issues(files, stats)
+    summary, llm_used = summarize(files, issue_dicts(files, findings))
 
-    summary, llm_used = call_llm_summarize(
-        issues=all_issue_dicts,
-        file_blocks=file_blocks,   
-    )
-    review.summary = summary
-    review.llm_used = llm_used
+    review = _build_review(files, findings, summary, llm_used)
+    db.add(review)
     db.commit()
     db.refresh(review)
     return review
+
+def analyze_batch(
+    db: Session,
+    items: list[list[tuple[str, str, str | None]] | Exception],
+    use_llm: bool = False,
+) -> list[dict]:
+    """
+    Analyze many independent reviews and persist them in one transaction.
+    items: per review, a list of (filename, content, language) tuples, or the
+    Exception raised while parsing that item (reported back as an error).
+    Returns one {index, id, status, error} dict per item, in order.
+    """
+    results: list[dict] = [{"index": i, "id": None, "status": "pending", "error": None} for i in range(len(items))]
+    analyzed: list[tuple[int, list[tuple[str, str, str | None]], list[list[RuleFinding]]]] = []
+
+    for i, item in enumerate(items):
+        if isinstance(item, Exception):
+            results[i].update(status="error", error=str(item))
+            continue
+        try:
+            analyzed.append((i, item, _collect_issues(item)))
+        except Exception as e:
+            results[i].update(status="error", error=f"Analysis failed: {e}")
+
+    # LLM calls are independent network round-trips: run them concurrently
+    # and before touching the DB, so the write transaction stays short.
+    if use_llm and analyzed:
+        with ThreadPoolExecutor(max_workers=settings.llm_batch_concurrency) as pool:
+            summaries = list(pool.map(lambda a: summarize(a[1], issue_dicts(a[1], a[2])), analyzed))
+    else:
+        summaries = [static_summary(issue_dicts(files, findings)) for _, files, findings in analyzed]
+
+    reviews = [
+        (i, _build_review(files, findings, summary, llm_used))
+        for (i, files, findings), (summary, llm_used) in zip(analyzed, summaries)
+    ]
+
+    try:
+        db.add_all([r for _, r in reviews])
+        db.commit()
+    except Exception:
+        # Something in the bulk insert was rejected; fall back to one
+        # savepoint per review so a single bad item can't sink the batch.
+        db.rollback()
+        reviews = [
+            (i, _build_review(files, findings, summary, llm_used))
+            for (i, files, findings), (summary, llm_used) in zip(analyzed, summaries)
+        ]
+        for i, review in reviews:
+            try:
+                with db.begin_nested():
+                    db.add(review)
+            except Exception as e:
+                results[i].update(status="error", error=f"Persist failed: {e}")
+        db.commit()
+
+    for i, review in reviews:
+        if results[i]["status"] == "pending":
+            results[i].update(id=review.id, status="ok")
+    return results
@@ -0,0 +1,112 @@
+from __future__ import annotations
+import ast
+from .rules import RuleContext
+
+CHECKS = frozenset({"ERR_SWALLOW", "PY_DEBUG_PRINT", "PY_MUTABLE_DEFAULT", "PY_EVAL_EXEC"})
+MUTABLE_CALLS = {"list", "dict", "set", "bytearray"}
+DYNAMIC_EXEC = {"eval", "exec"}
+
+
+def parse_python(ctx: RuleContext) -> ast.Module | None:
+    """
+    Parse ctx.content once and cache the result on the context, so every
+    rule (and any later stage holding the same context) reuses one tree.
+    Returns None when the file doesn't parse; the error is in ctx.cache.
+    """
+    if "py_tree" not in ctx.cache:
+        try:
+            ctx.cache["py_tree"] = ast.parse(ctx.content, filename=ctx.filename)
+            ctx.cache["py_syntax_error"] = None
+        except SyntaxError as e:
+            ctx.cache["py_tree"] = None
+            ctx.cache["py_syntax_error"] = e
+    return ctx.cache["py_tree"]
+
+
+def _is_main_guard(node: ast.If) -> bool:
+    t = node.test
+    return (
+        isinstance(t, ast.Compare)
+        and isinstance(t.left, ast.Name) and t.left.id == "__name__"
+        and len(t.comparators) == 1
+        and isinstance(t.comparators[0], ast.Constant) and t.comparators[0].value == "__main__"
+    )
+
+
+def _is_mutable(node: ast.expr | None) -> bool:
+    if isinstance(node, (ast.List, ast.Dict, ast.Set, ast.ListComp, ast.DictComp, ast.SetComp)):
+        return True
+    return isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in MUTABLE_CALLS
+
+
+class PythonAnalyzer(ast.NodeVisitor):
+    """
+    All AST-based Python checks, run in a single walk of the tree. Checks not
+    in `enabled` are skipped; the walk itself is shared by whatever is left.
+    """
+
+    def __init__(self, enabled: frozenset[str] = CHECKS) -> None:
+        # (rule_id, severity, message, line)
+        self.findings: list[tuple[str, str, str, int | None]] = []
+        self.enabled = enabled
+        self._main_guard_depth = 0
+
+    def _add(self, rule_id: str, severity: str, message: str, node: ast.AST) -> None:
+        self.findings.append((rule_id, severity, message, getattr(node, "lineno", None)))
+
+    def visit_If(self, node: ast.If) -> None:
+        if not _is_main_guard(node):
+            self.generic_visit(node)
+            return
+        self.visit(node.test)
+        self._main_guard_depth += 1
+        for child in node.body:
+            self.visit(child)
+        self._main_guard_depth -= 1
+        for child in node.orelse:
+            self.visit(child)
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler) -> None:
+        if "ERR_SWALLOW" in self.enabled and node.type is None and all(isinstance(s, ast.Pass) for s in node.body):
+            self._add("ERR_SWALLOW", "warn",
+                      "Bare except with pass swallows errors; catch specific exceptions.", node)
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        if isinstance(node.func, ast.Name):
+            if node.func.id == "print" and not self._main_guard_depth and "PY_DEBUG_PRINT" in self.enabled:
+                self._add("PY_DEBUG_PRINT", "info",
+                          "Debug print. Gate under `if __name__ == '__main__':` or use logging.", node)
+            elif node.func.id in DYNAMIC_EXEC and "PY_EVAL_EXEC" in self.enabled:
+                self._add("PY_EVAL_EXEC", "warn",
+                          f"Use of {node.func.id}() executes arbitrary code; avoid or restrict its input.", node)
+        self.generic_visit(node)
+
+    def _check_defaults(self, node: ast.FunctionDef | ast.AsyncFunctionDef | ast.Lambda) -> None:
+        if "PY_MUTABLE_DEFAULT" not in self.enabled:
+            return
+        for default in node.args.defaults + node.args.kw_defaults:
+            if _is_mutable(default):
+                self._add("PY_MUTABLE_DEFAULT", "warn",
+                          "Mutable default argument is shared between calls; default to None instead.", default)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self._check_defaults(node)
+        self.generic_visit(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        self._check_defaults(node)
+        self.generic_visit(node)
+
+    def visit_Lambda(self, node: ast.Lambda) -> None:
+        self._check_defaults(node)
+        self.generic_visit(node)
+
+
+def analyze_python(ctx: RuleContext, enabled: frozenset[str] = CHECKS) -> list[tuple[str, str, str, int | None]]:
+    tree = parse_python(ctx)
+    if tree is None or not enabled:
+        return []
+    analyzer = PythonAnalyzer(enabled)
+    analyzer.visit(tree)
+    return analyzer.findings
@@ -0,0 +1,200 @@
+from __future__ import annotations
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+from importlib.metadata import entry_points
+from typing import Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "code_review_assistant.rules"
+
+
+@dataclass
+class RuleContext:
+    """Everything a rule may look at for one file; derived views are computed once and shared."""
+    filename: str
+    language: str | None
+    content: str
+    cache: dict = field(default_factory=dict)   # parsed artifacts (e.g. Python AST) shared across rules
+
+    @cached_property
+    def lines(self) -> list[str]:
+        return self.content.splitlines()
+
+
+RuleFunc = Callable[[RuleContext], Iterable]
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    func: RuleFunc
+    languages: frozenset[str] | None = None   # None = every language
+    # Finding ids emitted by a multi-check rule (e.g. one AST walk). Those
+    # checks share one timing entry, but can still be disabled one by one.
+    provides: frozenset[str] | None = None
+
+    def applies_to(self, language: str | None) -> bool:
+        return self.languages is None or language in self.languages
+
+    def enabled_checks(self, disabled: set[str]) -> frozenset[str]:
+        return (self.provides or frozenset({self.name})) - disabled
+
+
+@dataclass
+class RuleStats:
+    calls: int = 0
+    findings: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    errors: int = 0
+
+    def add(self, elapsed_ms: float, found: int, failed: bool = False) -> None:
+        self.calls += 1
+        self.findings += found
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.errors += failed
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "findings": self.findings,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "errors": self.errors,
+        }
+
+
+def merge_stats(dst: dict[str, RuleStats], src: dict[str, RuleStats]) -> None:
+    for name, s in src.items():
+        agg = dst.setdefault(name, RuleStats())
+        agg.calls += s.calls
+        agg.findings += s.findings
+        agg.total_ms += s.total_ms
+        agg.max_ms = max(agg.max_ms, s.max_ms)
+        agg.errors += s.errors
+
+
+class RuleProfiler:
+    """Process-wide per-rule timing and hit counters."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: dict[str, RuleStats] = {}
+
+    def merge(self, stats: dict[str, RuleStats]) -> None:
+        with self._lock:
+            merge_stats(self._stats, stats)
+
+    def report(self) -> list[dict]:
+        with self._lock:
+            rows = [{"rule": name, **s.as_dict()} for name, s in self._stats.items()]
+        return sorted(rows, key=lambda r: r["total_ms"], reverse=True)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+@dataclass
+class RuleRegistry:
+    rules: dict[str, Rule] = field(default_factory=dict)
+    disabled: set[str] = field(default_factory=set)
+    _plugins_loaded: bool = False
+    _plugins_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, rule: Rule) -> Rule:
+        if rule.name in self.rules:
+            logger.warning("Rule %s registered twice; keeping the latest.", rule.name)
+        self.rules[rule.name] = rule
+        return rule
+
+    def register(
+        self,
+        name: str,
+        languages: Iterable[str] | None = None,
+        provides: Iterable[str] | None = None,
+    ) -> Callable[[RuleFunc], RuleFunc]:
+        """Decorator: @registry.register("MY_RULE", languages=["python"])."""
+        def deco(func: RuleFunc) -> RuleFunc:
+            self.add(Rule(
+                name=name,
+                func=func,
+                languages=frozenset(languages) if languages else None,
+                provides=frozenset(provides) if provides else None,
+            ))
+            return func
+        return deco
+
+    def load_plugins(self) -> None:
+        """
+        Load third-party rule packs from the `code_review_assistant.rules`
+        entry-point group. An entry point may resolve to a Rule, an iterable
+        of Rules, or a callable taking this registry. Threads that arrive
+        while packs are loading wait, so none sees a partly filled registry.
+        """
+        if self._plugins_loaded:
+            return
+        with self._plugins_lock:
+            if self._plugins_loaded:
+                return
+            for ep in entry_points(group=ENTRY_POINT_GROUP):
+                try:
+                    obj = ep.load()
+                    if isinstance(obj, Rule):
+                        self.add(obj)
+                    elif callable(obj):
+                        obj(self)
+                    else:
+                        for rule in obj:
+                            self.add(rule)
+                except Exception:
+                    logger.exception("Failed to load rule pack %s", ep.name)
+            self._plugins_loaded = True
+
+    def rules_for(self, language: str | None) -> list[Rule]:
+        self.load_plugins()
+        return [
+            r for r in list(self.rules.values())
+            if r.name not in self.disabled and r.enabled_checks(self.disabled) and r.applies_to(language)
+        ]
+
+    def describe(self) -> list[dict]:
+        self.load_plugins()
+        return [
+            {
+                "rule": r.name,
+                "languages": sorted(r.languages) if r.languages else None,
+                "enabled": r.name not in self.disabled and bool(r.enabled_checks(self.disabled)),
+                "provides": (
+                    [{"rule": p, "enabled": p not in self.disabled} for p in sorted(r.provides)]
+                    if r.provides else None
+                ),
+            }
+            for r in list(self.rules.values())
+        ]
+
+
+def run_rules(rules: list[Rule], ctx: RuleContext, stats: dict[str, RuleStats]) -> list:
+    """
+    Run each rule against ctx, timing it. A rule that raises is logged and
+    counted as an error, and the remaining rules still run.
+    """
+    findings: list = []
+    for rule in rules:
+        start = time.perf_counter()
+        failed = False
+        try:
+            found = list(rule.func(ctx))
+        except Exception:
+            logger.exception("Rule %s failed on %s", rule.name, ctx.filename)
+            found, failed = [], True
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        stats.setdefault(rule.name, RuleStats()).add(elapsed_ms, len(found), failed)
+        findings += found
+    return findings
@@ -1,7 +1,12 @@
 from __future__ import annotations
-import ast
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Optional
+from ...config import get_settings
+from .rules import RuleContext, RuleProfiler, RuleRegistry, RuleStats, merge_stats, run_rules
+from .python_ast import CHECKS as PY_AST_CHECKS, analyze_python, parse_python
+
+settings = get_settings()
+
 @dataclass
 class Finding:
     rule_id: str
@@ -14,47 +19,70 @@ class RuleFinding:
     severity: str  
     message: str
     line: int | None = None
-def check_python_syntax(filename: str, content: str) -> List[Finding]:
-    """Report SyntaxError locations for .py files using Python's AST parser."""
-    if not filename.endswith(".py"):
-        return []
-    try:
-        ast.parse(content, filename=filename)
+
+registry = RuleRegistry(disabled=set(settings.disabled_rules))
+profiler = RuleProfiler()
+
+@registry.register("STYLE_LONG_LINE")
+def long_lines(ctx: RuleContext) -> list[RuleFinding]:
+    return [
+        RuleFinding("STYLE_LONG_LINE", "info", f"Line exceeds 120 chars ({len(line)}). Consider wrapping.", idx)
+        for idx, line in enumerate(ctx.lines, start=1)
+        if len(line) > 120
+    ]
+
+@registry.register("DOC_TODO_NO_OWNER")
+def todo_without_owner(ctx: RuleContext) -> list[RuleFinding]:
+    return [
+        RuleFinding("DOC_TODO_NO_OWNER", "warn", "TODO without an owner (e.g., TODO @alice: ...).", idx)
+        for idx, line in enumerate(ctx.lines, start=1)
+        if "TODO" in line and "@" not in line
+    ]
+
+SECRET_MARKERS = ["AWS_SECRET_ACCESS_KEY", "BEGIN PRIVATE KEY", "password=", "passwd="]
+
+@registry.register("SEC_SECRET_LEAK")
+def secret_leak(ctx: RuleContext) -> list[RuleFinding]:
+    return [
+        RuleFinding("SEC_SECRET_LEAK", "error", "Possible secret in source. Remove and rotate credentials.", idx)
+        for idx, line in enumerate(ctx.lines, start=1)
+        if any(m in line for m in SECRET_MARKERS)
+    ]
+
+@registry.register("PY_AST", languages=["python"], provides=PY_AST_CHECKS)
+def python_ast_checks(ctx: RuleContext) -> list[RuleFinding]:
+    """
+    ERR_SWALLOW, PY_DEBUG_PRINT, PY_MUTABLE_DEFAULT, PY_EVAL_EXEC in one AST walk.
+    They are profiled together as PY_AST (one walk can't be timed per check);
+    disabling one id skips its work inside the walk.
+    """
+    enabled = registry.rules["PY_AST"].enabled_checks(registry.disabled)
+    return [RuleFinding(*f) for f in analyze_python(ctx, enabled)]
+
+@registry.register("PY_SYNTAX_ERROR", languages=["python"])
+def python_syntax(ctx: RuleContext) -> list[Finding]:
+    if parse_python(ctx) is not None:
         return []
-    except SyntaxError as e:
-        return [Finding(
-            rule_id="PY_SYNTAX_ERROR",
-            severity="error",
-            message=f"{e.msg}",
-            line=e.lineno or None,
-        )]
-
-def run_static_rules(filename: str, language: str | None, content: str) -> list[RuleFinding]:
-    findings: list[RuleFinding] = []
-    lines = content.splitlines()
-
-    for idx, line in enumerate(lines, start=1):
-        if len(line) > 120:
-            findings.append(RuleFinding("STYLE_LONG_LINE", "info",
-                                        f"Line exceeds 120 chars ({len(line)}). Consider wrapping.", idx))
-
-    for idx, line in enumerate(lines, start=1):
-        if "TODO" in line and "@" not in line:
-            findings.append(RuleFinding("DOC_TODO_NO_OWNER", "warn",
-                                        "TODO without an owner (e.g., TODO @alice: ...).", idx))
-
-    secret_markers = ["AWS_SECRET_ACCESS_KEY", "BEGIN PRIVATE KEY", "password=", "passwd="]
-    for idx, line in enumerate(lines, start=1):
-        if any(m in line for m in secret_markers):
-            findings.append(RuleFinding("SEC_SECRET_LEAK", "error",
-                                        "Possible secret in source. Remove and rotate credentials.", idx))
-
-    if (language == "python") and "print(" in content and "if __name__" not in content:
-        findings.append(RuleFinding("PY_DEBUG_PRINT", "info",
-                                    "Debug prints found. Gate under `if __name__ == '__main__':` or use logging.", None))
-
-    if "except:" in content and "pass" in content:
-        findings.append(RuleFinding("ERR_SWALLOW", "warn",
-                                    "Bare except with pass swallows errors; catch specific exceptions.", None))
-    findings += check_python_syntax(filename, content)
+    e = ctx.cache["py_syntax_error"]
+    return [Finding(rule_id="PY_SYNTAX_ERROR", severity="error", message=f"{e.msg}", line=e.lineno or None)]
+
+def run_static_rules(
+    filename: str,
+    language: str | None,
+    content: str,
+    stats: dict[str, RuleStats] | None = None,
+) -> list[RuleFinding]:
+    """
+    Run every enabled rule registered for `language` against one file.
+    Per-rule timings are always added to the process-wide `profiler`, and
+    also to `stats` when the caller wants them for a single review.
+    """
+    local: dict[str, RuleStats] = {}
+    findings = run_rules(registry.rules_for(language), RuleContext(filename, language, content), local)
+    if registry.disabled:
+        # Multi-check rules (PY_AST) can emit ids that were disabled individually.
+        findings = [f for f in findings if f.rule_id not in registry.disabled]
+    profiler.merge(local)
+    if stats is not None:
+        merge_stats(stats, local)
     return findings
@@ -0,0 +1,45 @@
+from .static_rules import RuleFinding
+from .llm_client import call_llm_summarize
+from ...config import get_settings
+from ...utils.file_utils import head_tail
+
+settings = get_settings()
+
+def make_preview_blocks(files: list[tuple[str, str, str | None]]) -> list[dict]:
+    """
+    Build per-file previews constrained by settings.llm_per_file_chars and total budget.
+    Returns list of dicts: {filename, language, preview}
+    """
+    per_file = settings.llm_per_file_chars
+    total_budget = settings.llm_total_chars
+
+    blocks: list[dict] = []
+    remaining = total_budget
+
+    for (filename, content, lang) in files:
+        if remaining <= 0:
+            break
+        preview = head_tail(content, per_file)
+        if len(preview) > remaining:
+            preview = preview[:remaining]
+        blocks.append({"filename": filename, "language": lang or "unknown", "preview": preview})
+        remaining -= len(preview)
+    return blocks
+
+def issue_dicts(files: list[tuple[str, str, str | None]], findings: list[list[RuleFinding]]) -> list[dict]:
+    out: list[dict] = []
+    for (filename, _content, lang), file_findings in zip(files, findings):
+        for f in file_findings:
+            out.append({
+                "rule_id": f.rule_id,
+                "severity": f.severity,
+                "message": f.message,
+                "line": f.line,
+                "filename": filename,
+                "language": lang or "unknown",
+            })
+    return out
+
+def summarize(files: list[tuple[str, str, str | None]], issues: list[dict]) -> tuple[str, bool]:
+    """LLM summary (or static fallback) over previews of `files` and the flattened `issues`."""
+    return call_llm_summarize(issues=issues, file_blocks=make_preview_blocks(files))
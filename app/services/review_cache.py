@@ -0,0 +1,175 @@
+from __future__ import annotations
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from ..config import get_settings
+from ..models import Review, ReviewFile, ReviewIssue
+
+settings = get_settings()
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag over the serialized bytes: any change to the review (or a reused id) changes it."""
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [t.strip() for t in if_none_match.split(",")]
+    return "*" in candidates or any(t.removeprefix("W/") == etag for t in candidates)
+
+
+@dataclass
+class CacheEntry:
+    body: bytes
+    etag: str
+    created_at: datetime        # identity check: a reused id has a different created_at
+    validated_at: float         # time.monotonic() of the last DB revalidation
+
+
+class ReviewCache:
+    """
+    In-process LRU of pre-serialized review JSON, bounded by total bytes.
+    Keys are (review_id, kind), where kind is the endpoint's representation
+    ("review" for ReviewOut, "export" for the export payload).
+
+    The cache is per worker process, so a delete handled by another worker is
+    not seen here. Callers revalidate an entry against the DB (one primary-key
+    lookup) unless it was checked within `trust_seconds`; that window bounds
+    how long another worker's delete can go unnoticed.
+    """
+
+    def __init__(self, max_bytes: int, trust_seconds: float = 0.0) -> None:
+        self.max_bytes = max_bytes
+        self.trust_seconds = trust_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[int, str], CacheEntry] = OrderedDict()
+        self._by_review: dict[int, set[str]] = {}
+        # Only ids with a render in flight are tracked; both maps drop the
+        # id again when its last render finishes.
+        self._rendering: dict[int, int] = {}
+        self._generation: dict[int, int] = {}
+        self._size = 0
+
+    def get(self, review_id: int, kind: str) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get((review_id, kind))
+            if entry is not None:
+                self._entries.move_to_end((review_id, kind))
+            return entry
+
+    def needs_revalidation(self, entry: CacheEntry) -> bool:
+        return time.monotonic() - entry.validated_at >= self.trust_seconds
+
+    def mark_validated(self, entry: CacheEntry) -> None:
+        entry.validated_at = time.monotonic()
+
+    @contextmanager
+    def rendering(self, review_id: int) -> Iterator[int]:
+        """
+        Wrap a cache fill: yields the generation to pass to put(), which
+        drops the result if the review was invalidated while it rendered.
+        """
+        with self._lock:
+            self._rendering[review_id] = self._rendering.get(review_id, 0) + 1
+            generation = self._generation.get(review_id, 0)
+        try:
+            yield generation
+        finally:
+            with self._lock:
+                remaining = self._rendering.pop(review_id) - 1
+                if remaining:
+                    self._rendering[review_id] = remaining
+                else:
+                    self._generation.pop(review_id, None)
+
+    def put(self, review_id: int, kind: str, body: bytes, etag: str, created_at: datetime, generation: int) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if self._generation.get(review_id, 0) != generation:
+                return
+            self._remove((review_id, kind))
+            self._entries[(review_id, kind)] = CacheEntry(body, etag, created_at, time.monotonic())
+            self._by_review.setdefault(review_id, set()).add(kind)
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: tuple[int, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._size -= len(entry.body)
+        kinds = self._by_review.get(key[0])
+        if kinds is not None:
+            kinds.discard(key[1])
+            if not kinds:
+                del self._by_review[key[0]]
+
+    def invalidate(self, review_id: int) -> None:
+        with self._lock:
+            if review_id in self._rendering:
+                self._generation[review_id] = self._generation.get(review_id, 0) + 1
+            for kind in list(self._by_review.get(review_id, ())):
+                self._remove((review_id, kind))
+
+    def invalidate_many(self, review_ids: set[int]) -> None:
+        for review_id in review_ids:
+            self.invalidate(review_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_review.clear()
+            self._size = 0
+
+
+review_cache = ReviewCache(settings.review_cache_max_bytes, settings.review_cache_trust_seconds)
+
+_PENDING_KEY = "review_cache_pending"
+_CREATED_KEY = "review_cache_created"
+
+
+# Any ORM-level change to a review or its children drops the cached bytes,
+# so new mutation paths are covered without calling invalidate() by hand.
+# Ids are collected at flush and only invalidated once the transaction has
+# committed, so a concurrent reader can't re-cache pre-commit data.
+# Reviews created in this transaction can't be cached yet, so neither they
+# nor the files and issues added under them are collected.
+@event.listens_for(Session, "after_flush")
+def _collect_changed_reviews(session: Session, _flush_context) -> None:
+    pending: set[int] = session.info.setdefault(_PENDING_KEY, set())
+    created: set[int] = session.info.setdefault(_CREATED_KEY, set())
+    created.update(obj.id for obj in session.new if isinstance(obj, Review))
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Review):
+            review_id = obj.id
+        elif isinstance(obj, (ReviewFile, ReviewIssue)):
+            review_id = obj.review_id
+        else:
+            continue
+        if review_id is not None and review_id not in created:
+            pending.add(review_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    session.info.pop(_CREATED_KEY, None)
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        review_cache.invalidate_many(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_CREATED_KEY, None)
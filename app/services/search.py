@@ -0,0 +1,225 @@
+from __future__ import annotations
+import html
+import re
+from sqlalchemy import DDL, bindparam, event, text
+from sqlalchemy.orm import Session
+from ..models import ReviewFile, ReviewIssue
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+# The database wraps matches in these private-use sentinels; search() then
+# HTML-escapes the stored text and only afterwards turns them into <mark>
+# tags, so code containing <, > or & can't break (or inject into) the markup.
+_SENTINEL_START = "\ue000"
+_SENTINEL_END = "\ue001"
+
+# SQLite: external-content FTS5 tables kept in sync by triggers, so the
+# indexed text is never stored twice. `_` is a token char so identifiers
+# like `get_db` match as a whole.
+SQLITE_DDL: dict[str, list[str]] = {
+    "review_files": [
+        """CREATE VIRTUAL TABLE IF NOT EXISTS review_files_fts USING fts5(
+            content, content='review_files', content_rowid='id',
+            tokenize="unicode61 tokenchars '_'")""",
+        """CREATE TRIGGER IF NOT EXISTS review_files_fts_ai AFTER INSERT ON review_files BEGIN
+            INSERT INTO review_files_fts(rowid, content) VALUES (new.id, new.content);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS review_files_fts_ad AFTER DELETE ON review_files BEGIN
+            INSERT INTO review_files_fts(review_files_fts, rowid, content) VALUES ('delete', old.id, old.content);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS review_files_fts_au AFTER UPDATE ON review_files BEGIN
+            INSERT INTO review_files_fts(review_files_fts, rowid, content) VALUES ('delete', old.id, old.content);
+            INSERT INTO review_files_fts(rowid, content) VALUES (new.id, new.content);
+        END""",
+    ],
+    "review_issues": [
+        """CREATE VIRTUAL TABLE IF NOT EXISTS review_issues_fts USING fts5(
+            message, content='review_issues', content_rowid='id',
+            tokenize="unicode61 tokenchars '_'")""",
+        """CREATE TRIGGER IF NOT EXISTS review_issues_fts_ai AFTER INSERT ON review_issues BEGIN
+            INSERT INTO review_issues_fts(rowid, message) VALUES (new.id, new.message);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS review_issues_fts_ad AFTER DELETE ON review_issues BEGIN
+            INSERT INTO review_issues_fts(review_issues_fts, rowid, message) VALUES ('delete', old.id, old.message);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS review_issues_fts_au AFTER UPDATE ON review_issues BEGIN
+            INSERT INTO review_issues_fts(review_issues_fts, rowid, message) VALUES ('delete', old.id, old.message);
+            INSERT INTO review_issues_fts(rowid, message) VALUES (new.id, new.message);
+        END""",
+    ],
+}
+
+# Postgres: a stored generated tsvector column is maintained by the database
+# itself on every insert/update, and disappears with the row on delete.
+POSTGRES_DDL: dict[str, list[str]] = {
+    "review_files": [
+        """ALTER TABLE review_files ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (to_tsvector('simple', coalesce(content, ''))) STORED""",
+        "CREATE INDEX IF NOT EXISTS ix_review_files_search ON review_files USING gin (search_vector)",
+    ],
+    "review_issues": [
+        """ALTER TABLE review_issues ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (to_tsvector('simple', coalesce(message, ''))) STORED""",
+        "CREATE INDEX IF NOT EXISTS ix_review_issues_search ON review_issues USING gin (search_vector)",
+    ],
+}
+
+for _table in (ReviewFile.__table__, ReviewIssue.__table__):
+    for _stmt in SQLITE_DDL[_table.name]:
+        event.listen(_table, "after_create", DDL(_stmt).execute_if(dialect="sqlite"))
+    for _stmt in POSTGRES_DDL[_table.name]:
+        event.listen(_table, "after_create", DDL(_stmt).execute_if(dialect="postgresql"))
+
+# Search runs in two phases: rank and paginate over (kind, id, rank) only,
+# then highlight and fetch bodies for just the rows on the requested page.
+_SQLITE_RANK = """
+SELECT 'file' AS kind, rowid AS id, bm25(review_files_fts) AS rank
+FROM review_files_fts WHERE review_files_fts MATCH :q
+UNION ALL
+SELECT 'issue', rowid, bm25(review_issues_fts)
+FROM review_issues_fts WHERE review_issues_fts MATCH :q
+ORDER BY rank, id DESC
+LIMIT :limit OFFSET :offset
+"""
+
+_SQLITE_FILE_PAGE = """
+SELECT f.id, f.review_id, f.id AS file_id, f.filename, NULL AS line, f.content AS body,
+       snippet(review_files_fts, 0, :hl_start, :hl_end, '…', 16) AS snippet
+FROM review_files_fts JOIN review_files f ON f.id = review_files_fts.rowid
+WHERE review_files_fts MATCH :q AND review_files_fts.rowid IN :ids
+"""
+
+_SQLITE_ISSUE_PAGE = """
+SELECT i.id, i.review_id, i.file_id, rf.filename, i.line, NULL AS body,
+       snippet(review_issues_fts, 0, :hl_start, :hl_end, '…', 16) AS snippet
+FROM review_issues_fts JOIN review_issues i ON i.id = review_issues_fts.rowid
+LEFT JOIN review_files rf ON rf.id = i.file_id
+WHERE review_issues_fts MATCH :q AND review_issues_fts.rowid IN :ids
+"""
+
+_SQLITE_COUNT = """
+SELECT (SELECT count(*) FROM review_files_fts WHERE review_files_fts MATCH :q)
+     + (SELECT count(*) FROM review_issues_fts WHERE review_issues_fts MATCH :q)
+"""
+
+_PG_HEADLINE = "'StartSel=' || :hl_start || ', StopSel=' || :hl_end || ', MaxFragments=1, MaxWords=24, MinWords=8'"
+
+# ts_rank is "higher is better"; negate it so both backends sort ascending.
+_POSTGRES_RANK = """
+WITH query AS (SELECT websearch_to_tsquery('simple', :q) AS tsq)
+SELECT 'file' AS kind, f.id, -ts_rank(f.search_vector, query.tsq) AS rank
+FROM review_files f, query WHERE f.search_vector @@ query.tsq
+UNION ALL
+SELECT 'issue', i.id, -ts_rank(i.search_vector, query.tsq)
+FROM review_issues i, query WHERE i.search_vector @@ query.tsq
+ORDER BY rank, id DESC
+LIMIT :limit OFFSET :offset
+"""
+
+_POSTGRES_FILE_PAGE = f"""
+SELECT f.id, f.review_id, f.id AS file_id, f.filename, NULL::integer AS line, f.content AS body,
+       ts_headline('simple', f.content, websearch_to_tsquery('simple', :q), {_PG_HEADLINE}) AS snippet
+FROM review_files f WHERE f.id IN :ids
+"""
+
+_POSTGRES_ISSUE_PAGE = f"""
+SELECT i.id, i.review_id, i.file_id, rf.filename, i.line, NULL AS body,
+       ts_headline('simple', i.message, websearch_to_tsquery('simple', :q), {_PG_HEADLINE}) AS snippet
+FROM review_issues i LEFT JOIN review_files rf ON rf.id = i.file_id
+WHERE i.id IN :ids
+"""
+
+_POSTGRES_COUNT = """
+WITH query AS (SELECT websearch_to_tsquery('simple', :q) AS tsq)
+SELECT (SELECT count(*) FROM review_files f, query WHERE f.search_vector @@ query.tsq)
+     + (SELECT count(*) FROM review_issues i, query WHERE i.search_vector @@ query.tsq)
+"""
+
+_QUERIES = {
+    "sqlite": (_SQLITE_RANK, _SQLITE_COUNT, {"file": _SQLITE_FILE_PAGE, "issue": _SQLITE_ISSUE_PAGE}),
+    "postgresql": (_POSTGRES_RANK, _POSTGRES_COUNT, {"file": _POSTGRES_FILE_PAGE, "issue": _POSTGRES_ISSUE_PAGE}),
+}
+
+_TERM_RE = re.compile(r"\w+")
+
+
+def _query_terms(q: str) -> list[str]:
+    return _TERM_RE.findall(q)
+
+
+def _fts5_query(q: str) -> str:
+    """
+    Quote every term so user input (dots, colons, operators) can never be
+    parsed as FTS5 syntax. Terms are ANDed, matching websearch_to_tsquery.
+    """
+    return " ".join('"' + t.replace('"', '""') + '"' for t in _query_terms(q))
+
+
+def _first_match_line(content: str, terms: list[str]) -> int | None:
+    if not content or not terms:
+        return None
+    pattern = re.compile(r"\b(?:" + "|".join(re.escape(t) for t in terms) + r")\b", re.IGNORECASE)
+    m = pattern.search(content)
+    if not m:
+        return None
+    return content.count("\n", 0, m.start()) + 1
+
+
+def _render_snippet(raw: str | None) -> str:
+    if not raw:
+        return ""
+    return (
+        html.escape(raw, quote=False)
+        .replace(_SENTINEL_START, HIGHLIGHT_START)
+        .replace(_SENTINEL_END, HIGHLIGHT_END)
+    )
+
+
+def search(db: Session, q: str, limit: int, offset: int) -> tuple[int, list[dict]]:
+    """
+    Ranked full-text search over stored file contents and issue messages.
+    Returns (total_hits, hits) where each hit is a dict:
+    {kind, review_id, file_id, filename, line, snippet, rank}
+    `snippet` is HTML-escaped text with matches wrapped in <mark>.
+    """
+    terms = _query_terms(q)
+    if not terms:
+        return 0, []
+
+    dialect = db.get_bind().dialect.name
+    if dialect not in _QUERIES:
+        raise NotImplementedError(f"Full-text search is not supported on '{dialect}'.")
+    rank_sql, count_sql, page_sql = _QUERIES[dialect]
+    params = {"q": _fts5_query(q) if dialect == "sqlite" else q}
+
+    total = db.execute(text(count_sql), params).scalar_one()
+    ranked = db.execute(text(rank_sql), {**params, "limit": limit, "offset": offset}).all()
+
+    details: dict[tuple[str, int], dict] = {}
+    for kind in ("file", "issue"):
+        ids = [row.id for row in ranked if row.kind == kind]
+        if not ids:
+            continue
+        stmt = text(page_sql[kind]).bindparams(bindparam("ids", expanding=True))
+        page_params = {**params, "ids": ids, "hl_start": _SENTINEL_START, "hl_end": _SENTINEL_END}
+        for r in db.execute(stmt, page_params).mappings():
+            details[(kind, r["id"])] = dict(r)
+
+    hits: list[dict] = []
+    for row in ranked:
+        r = details.get((row.kind, row.id))
+        if r is None:   # deleted between the two phases
+            continue
+        line = r["line"]
+        if row.kind == "file":
+            line = _first_match_line(r["body"], terms)
+        hits.append({
+            "kind": row.kind,
+            "review_id": r["review_id"],
+            "file_id": r["file_id"],
+            "filename": r["filename"],
+            "line": line,
+            "snippet": _render_snippet(r["snippet"]),
+            "rank": float(row.rank),
+        })
+    return int(total), hits
@@ -1,5 +1,7 @@
+import os
 import re
 from pathlib import Path
+from typing import Iterable, Iterator
 
 EXT_TO_LANG = {
     ".py": "python",
@@ -28,3 +30,95 @@ def guess_is_minified(text: str) -> bool:
     if count_lines(text) <= 3 and len(text) > 500:
         return True
     return bool(re.search(r"[;{}]{20,}", text))
+
+def head_tail(text: str, limit: int) -> str:
+    """Keep the first and last limit//2 chars of text longer than limit. Applying it twice changes nothing."""
+    if len(text) <= limit:
+        return text
+    return text[: limit // 2] + "\n...\n" + text[-(limit // 2):]
+
+DEFAULT_EXCLUDES = [".git/", "__pycache__/", "node_modules/", ".venv/", "venv/"]
+
+def _glob_to_regex(pat: str) -> re.Pattern:
+    """
+    Translate a gitignore glob: `*`, `?` and `[...]` never cross a `/`;
+    only `**` does (`**/` = any leading dirs, `/**` = everything below).
+    """
+    out: list[str] = []
+    i, n = 0, len(pat)
+    while i < n:
+        c = pat[i]
+        if pat.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pat.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[" and "]" in pat[i + 2:]:
+            j = pat.index("]", i + 2)
+            body = pat[i + 1:j]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append("(?!/)[" + body.replace("\\", "\\\\") + "]")
+            i = j + 1
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return re.compile("".join(out) + r"\Z")
+
+class IgnoreRules:
+    """
+    The commonly used subset of .gitignore semantics: glob patterns, `!`
+    negation, trailing `/` for directories only, and patterns containing a
+    `/` anchored to the root. The last matching pattern wins.
+    """
+
+    def __init__(self, patterns: Iterable[str] = ()):
+        self._rules: list[tuple[re.Pattern, bool, bool, bool]] = []   # (regex, negate, dir_only, anchored)
+        for raw in patterns:
+            self.add(raw)
+
+    def add(self, raw: str) -> None:
+        pat = raw.strip()
+        if not pat or pat.startswith("#"):
+            return
+        negate = pat.startswith("!")
+        if negate:
+            pat = pat[1:]
+        dir_only = pat.endswith("/")
+        pat = pat.rstrip("/")
+        anchored = "/" in pat
+        self._rules.append((_glob_to_regex(pat.lstrip("/")), negate, dir_only, anchored))
+
+    def add_file(self, path: str | Path) -> None:
+        p = Path(path)
+        if p.is_file():
+            for line in p.read_text(encoding="utf-8", errors="replace").splitlines():
+                self.add(line)
+
+    def ignored(self, rel_path: str, is_dir: bool) -> bool:
+        name = rel_path.rsplit("/", 1)[-1]
+        result = False
+        for pat, negate, dir_only, anchored in self._rules:
+            if dir_only and not is_dir:
+                continue
+            if pat.match(rel_path if anchored else name):
+                result = not negate
+        return result
+
+def walk_tree(root: str | Path, ignore: IgnoreRules) -> Iterator[str]:
+    """Yield root-relative POSIX paths of files under `root`, pruning ignored directories, in sorted order."""
+    root = str(root)
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root).replace(os.sep, "/")
+        prefix = "" if rel_dir == "." else rel_dir + "/"
+        dirnames[:] = sorted(d for d in dirnames if not ignore.ignored(prefix + d, is_dir=True))
+        for f in sorted(filenames):
+            if not ignore.ignored(prefix + f, is_dir=False):
+                yield prefix + f
@@ -0,0 +1,51 @@
+"""
+Concurrent upload load test.
+
+Start the API with different worker counts and compare throughput, e.g.:
+
+    uvicorn app.main:app --workers 1 --port 8000 &
+    python scripts/loadtest_upload.py --url http://localhost:8000 --requests 400 --concurrency 32
+
+    uvicorn app.main:app --workers 4 --port 8000 &
+    python scripts/loadtest_upload.py --url http://localhost:8000 --requests 400 --concurrency 32
+
+With the SQLite WAL/busy_timeout engine settings every request should
+succeed (no "database is locked"), and req/s should grow with --workers.
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+
+SAMPLE = b"""import os
+
+def handler(event):
+    # TODO fix retries
+    try:
+        return os.environ["KEY"]
+    except:
+        pass
+"""
+
+def _upload(client: httpx.Client, url: str) -> int:
+    files = [("files", ("handler.py", SAMPLE)), ("files", ("util.js", b"console.log('x')\n"))]
+    return client.post(f"{url}/api/v1/reviews/upload", files=files).status_code
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--url", default="http://localhost:8000")
+    ap.add_argument("--requests", type=int, default=200)
+    ap.add_argument("--concurrency", type=int, default=16)
+    args = ap.parse_args()
+
+    with httpx.Client(timeout=60) as client, ThreadPoolExecutor(args.concurrency) as pool:
+        start = time.perf_counter()
+        codes = list(pool.map(lambda _: _upload(client, args.url), range(args.requests)))
+        elapsed = time.perf_counter() - start
+
+    ok = sum(1 for c in codes if c == 200)
+    print(f"{args.requests} uploads, concurrency={args.concurrency}: "
+          f"{ok} ok, {len(codes) - ok} failed, {elapsed:.2f}s, {args.requests / elapsed:.1f} req/s")
+
+if __name__ == "__main__":
+    main()